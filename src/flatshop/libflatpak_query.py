@@ -39,29 +39,55 @@ gi.require_version("AppStream", "1.0")
 gi.require_version("Flatpak", "1.0")
 
 import argparse
+import functools
 import json
 import logging
 import os
+import pickle
+import re
 import sys
 import tempfile
 import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from pathlib import Path
 from urllib.parse import quote_plus, urlparse
 
+import marisa_trie
 import requests
 from gi.repository import AppStream, Flatpak, Gio, GLib
 
+try:
+    import numpy as np
+except ImportError:
+    # Optional: the corpus-scan search path below works without it
+    np = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class Match(IntEnum):
+    NONE = 0
     NAME = 1
     ID = 2
     SUMMARY = 3
-    NONE = 4
+
+
+# Plain-int aliases for the hot search loops: IntEnum member access and
+# comparison go through the enum machinery, which shows up when done once
+# per package per keystroke. Match itself is kept for naming match types.
+_M_NONE = int(Match.NONE)
+_M_NAME = int(Match.NAME)
+_M_ID = int(Match.ID)
+_M_SUMMARY = int(Match.SUMMARY)
+
+# Shared interning table for lowercased category names: thousands of apps
+# reuse a few dozen distinct categories, so every package ends up pointing
+# at the same string objects instead of allocating its own copies.
+_CAT_INTERN: dict[str, str] = {}
 
 
 class AppStreamComponentKind(IntEnum):
@@ -120,40 +146,75 @@ class AppStreamComponentKind(IntEnum):
 
 
 class AppStreamPackage:
-    def __init__(self, comp: AppStream.Component, remote: Flatpak.Remote) -> None:
+    def __init__(
+        self,
+        comp: AppStream.Component,
+        remote: Flatpak.Remote,
+        bundle: AppStream.Bundle = None,
+        appstream_dir: str = None,
+    ) -> None:
         self.component: AppStream.Component = comp
         self.remote: Flatpak.Remote = remote
         self.repo_name: str = remote.get_name()
-        bundle: AppStream.Bundle = comp.get_bundle(AppStream.BundleKind.FLATPAK)
+        # Appstream dir resolved once per remote by the loader; looking it up
+        # through GObject per package (and per icon size) adds up.
+        self._appstream_dir = appstream_dir
+        if bundle is None:
+            bundle = comp.get_bundle(AppStream.BundleKind.FLATPAK)
         self.flatpak_bundle: str = bundle.get_id()
-        self.match = Match.NONE
-
-        # Get icon and description
-        self.icon_url = self._get_icon_url()
-        self.icon_path_128 = self._get_icon_cache_path("128x128")
-        self.icon_path_64 = self._get_icon_cache_path("64x64")
-        self.icon_filename = self._get_icon_filename()
-        self.description = self.component.get_description()
-
-        # Get URLs from the component
-        self.urls = self._get_urls()
-
-        self.developer = self.component.get_developer().get_name()
-        self.categories = self._get_categories()
-
-    @property
-    def id(self) -> str:
-        return self.component.get_id()
-
-    @property
-    def name(self) -> str:
-        return self.component.get_name()
-
-    @property
-    def summary(self) -> str:
-        return self.component.get_summary()
-
-    @property
+        self.match = _M_NONE
+
+        # Fetch the searchable fields once; every keystroke used to cross into
+        # GObject and re-lower these for each package.
+        self.name: str = comp.get_name() or ""
+        self.id: str = comp.get_id() or ""
+        self.summary: str = comp.get_summary() or ""
+        self._name_l = self.name.lower()
+        self._id_l = self.id.lower()
+        self._summary_l = self.summary.lower()
+        # One NUL-joined haystack so search() is a single C-level find; the
+        # boundary offsets map a hit position back to the field it landed in.
+        self._haystack = f"{self._name_l}\x00{self._id_l}\x00{self._summary_l}"
+        self._b1 = len(self._name_l)
+        self._b2 = self._b1 + 1 + len(self._id_l)
+
+    # Icons, description, URLs, developer and categories each cost one or
+    # more GObject roundtrips, and most catalog packages are never displayed,
+    # so they are resolved lazily on first access and cached.
+
+    @functools.cached_property
+    def icon_url(self) -> str:
+        return self._get_icon_url()
+
+    @functools.cached_property
+    def icon_path_128(self) -> str:
+        return self._get_icon_cache_path("128x128")
+
+    @functools.cached_property
+    def icon_path_64(self) -> str:
+        return self._get_icon_cache_path("64x64")
+
+    @functools.cached_property
+    def icon_filename(self) -> str:
+        return self._get_icon_filename()
+
+    @functools.cached_property
+    def description(self) -> str:
+        return self.component.get_description()
+
+    @functools.cached_property
+    def urls(self) -> dict:
+        return self._get_urls()
+
+    @functools.cached_property
+    def developer(self) -> str:
+        return self.component.get_developer().get_name()
+
+    @functools.cached_property
+    def categories(self) -> list:
+        return self._get_categories()
+
+    @functools.cached_property
     def version(self) -> str | None:
         releases = self.component.get_releases_plain()
         if releases:
@@ -163,7 +224,7 @@ class AppStreamPackage:
                 return version
         return None
 
-    @property
+    @functools.cached_property
     def kind(self):
         kind = self.component.get_kind()
         kind_str = str(kind)
@@ -172,32 +233,30 @@ class AppStreamPackage:
             if member.name in kind_str:
                 return member.name
 
+    @functools.cached_property
+    def _icon_buckets(self) -> dict:
+        """First icon of each kind, collected in one pass over the icon list
+        so looking up several kinds costs a single round of get_kind() calls"""
+        buckets = {}
+        for icon in self.component.get_icons():
+            buckets.setdefault(icon.get_kind(), icon)
+        return buckets
+
     def _get_icon_url(self) -> str:
         """Get the remote icon URL from the component"""
-        icons = self.component.get_icons()
-
-        # Find the first REMOTE icon
-        remote_icon = next(
-            (icon for icon in icons if icon.get_kind() == AppStream.IconKind.REMOTE), None
-        )
+        remote_icon = self._icon_buckets.get(AppStream.IconKind.REMOTE)
         return remote_icon.get_url() if remote_icon else ""
 
     def _get_icon_filename(self) -> str:
         """Get the cached icon filename from the component"""
-        icons = self.component.get_icons()
-
-        # Find the first CACHED icon
-        cached_icon = next(
-            (icon for icon in icons if icon.get_kind() == AppStream.IconKind.CACHED), None
-        )
+        cached_icon = self._icon_buckets.get(AppStream.IconKind.CACHED)
         return cached_icon.get_filename() if cached_icon else ""
 
     def _get_icon_cache_path(self, size: str) -> str:
         # Appstream icon cache path for the flatpak repo queried
-        icon_cache_path = Path(
-            self.remote.get_appstream_dir().get_path() + "/icons/flatpak/" + size + "/"
-        )
-        return str(icon_cache_path)
+        if self._appstream_dir is None:
+            self._appstream_dir = self.remote.get_appstream_dir().get_path()
+        return f"{self._appstream_dir}/icons/flatpak/{size}"
 
     def _get_urls(self) -> dict:
         """Get URLs from the component"""
@@ -219,25 +278,80 @@ class AppStreamPackage:
 
     def _get_categories(self) -> list:
         categories_fetch = self.component.get_categories()
-        categories = []
+        categories = set()
         for category in categories_fetch:
-            categories.append(category.lower())
-        return categories
-
-    def search(self, keyword: str) -> Match:
-        """Search for keyword in package details"""
-        if keyword in self.name.lower():
-            return Match.NAME
-        elif keyword in self.id.lower():
-            return Match.ID
-        elif keyword in self.summary.lower():
-            return Match.SUMMARY
+            key = category.lower()
+            categories.add(_CAT_INTERN.setdefault(key, sys.intern(key)))
+        # Deduplicated but kept a sorted list: consumers format and join the
+        # categories, so the public type has to stay a deterministic sequence
+        return sorted(categories)
+
+    def search(self, keyword: str) -> int:
+        """Search for keyword in package details, returning a Match value"""
+        i = self._haystack.find(keyword)
+        if i < 0:
+            return _M_NONE
+        elif i < self._b1:
+            return _M_NAME
+        elif i < self._b2:
+            return _M_ID
         else:
-            return Match.NONE
+            return _M_SUMMARY
 
     def __str__(self) -> str:
         return f"{self.name} - {self.summary} ({self.flatpak_bundle})"
 
+    # Lazy fields carried by the on-disk catalog snapshot. They are seeded
+    # straight into __dict__ on restore, which is exactly where
+    # functools.cached_property stores its computed value.
+    _SNAPSHOT_FIELDS = (
+        "kind",
+        "version",
+        "icon_url",
+        "icon_path_128",
+        "icon_path_64",
+        "icon_filename",
+        "description",
+        "urls",
+        "developer",
+        "categories",
+    )
+
+    def _to_snapshot(self) -> dict:
+        """Return the package as plain data for the on-disk catalog snapshot"""
+        snapshot = {
+            "name": self.name,
+            "id": self.id,
+            "summary": self.summary,
+            "bundle": self.flatpak_bundle,
+        }
+        for field in self._SNAPSHOT_FIELDS:
+            snapshot[field] = getattr(self, field)
+        return snapshot
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: dict, remote: Flatpak.Remote) -> "AppStreamPackage":
+        """Rebuild a package from snapshot data without touching AppStream"""
+        package = cls.__new__(cls)
+        package.component = None
+        package.remote = remote
+        package.repo_name = remote.get_name()
+        package._appstream_dir = None
+        package.flatpak_bundle = snapshot["bundle"]
+        package.match = _M_NONE
+        package.name = snapshot["name"]
+        package.id = snapshot["id"]
+        package.summary = snapshot["summary"]
+        package._name_l = package.name.lower()
+        package._id_l = package.id.lower()
+        package._summary_l = package.summary.lower()
+        package._haystack = f"{package._name_l}\x00{package._id_l}\x00{package._summary_l}"
+        package._b1 = len(package._name_l)
+        package._b2 = package._b1 + 1 + len(package._id_l)
+        for field in cls._SNAPSHOT_FIELDS:
+            package.__dict__[field] = snapshot[field]
+        return package
+
     def get_details(self) -> dict:
         """Get all package details including icon and description"""
         return {
@@ -256,7 +370,7 @@ class AppStreamPackage:
             # "architectures": self.architectures,
             "categories": self.categories,
             "bundle_id": self.flatpak_bundle,
-            "match_type": self.match.name,
+            "match_type": Match(self.match).name,
             "repo": self.repo_name,
         }
 
@@ -266,6 +380,27 @@ class AppstreamSearcher:
 
     def __init__(self, refresh=False) -> None:
         self.remotes: dict[str, list[AppStreamPackage]] = {}
+        # Columnar search index per remote: parallel lists of lowercased
+        # name/id/summary plus bundle IDs, the concatenated corpus with
+        # per-package end offsets for the single-scan substring search, and a
+        # double-array trie over names/IDs for prefix queries. Searching walks
+        # these contiguous columns; AppStreamPackage objects are only touched
+        # for actual hits via _materialize().
+        self._index: dict[str, dict] = {}
+        # Refs of installed apps, computed once per installation so callers
+        # get O(1) membership tests instead of re-listing installed refs.
+        self.installed: set[str] = set()
+        # Lazily loaded AppStream.Pool for native (C-side) ranked search,
+        # plus a bundle-id lookup to map pool results onto indexed packages.
+        self._pool = None
+        self._bundle_map: dict[str, tuple[str, int]] = {}
+        self._bundle_map_generation = -1
+        self._id_map: dict[str, list[tuple[str, int]]] = {}
+        self._id_map_generation = -1
+        # Memoize repeated queries (retyped/backspaced searches); bumping the
+        # generation whenever a remote is (re)loaded invalidates stale entries.
+        self._generation = 0
+        self._search_cached = functools.lru_cache(maxsize=256)(self._search_repo_indices)
         self.refresh_progress = 0
         self.refresh = refresh
 
@@ -402,30 +537,111 @@ class AppstreamSearcher:
 
     def add_installation(self, inst: Flatpak.Installation):
         """Add enabled flatpak repositories from Flatpak.Installation"""
-        remotes = inst.list_remotes()
-        for remote in remotes:
-            if not remote.get_disabled():
+        self.installed = {
+            ref.format_ref() for ref in inst.list_installed_refs_by_kind(Flatpak.RefKind.APP)
+        }
+        remotes = [
+            remote
+            for remote in inst.list_remotes()
+            if not remote.get_disabled() and remote.get_name() not in self.remotes
+        ]
+        if len(remotes) > 1:
+            # The refresh phase modifies shared installation state, so it
+            # runs serially; parsing is independent per remote and dominated
+            # by libappstream's native XML parse, which releases the GIL, so
+            # those overlap in threads. Index building stays on this thread.
+            for remote in remotes:
+                self._refresh_remote_metadata(remote, inst)
+            with ThreadPoolExecutor(max_workers=len(remotes)) as executor:
+                futures = [
+                    executor.submit(self._parse_appstream_metadata, remote) for remote in remotes
+                ]
+                for remote, future in zip(remotes, futures):
+                    packages = future.result()
+                    self.remotes[remote.get_name()] = packages
+                    self._build_search_index(remote.get_name(), packages)
+        else:
+            for remote in remotes:
                 self.add_remote(remote, inst)
 
     def add_remote(self, remote: Flatpak.Remote, inst: Flatpak.Installation):
         """Add packages for a given Flatpak.Remote"""
         remote_name = remote.get_name()
         if remote_name not in self.remotes:
-            self.remotes[remote_name] = self._load_appstream_metadata(remote, inst)
+            packages = self._load_appstream_metadata(remote, inst)
+            self.remotes[remote_name] = packages
+            self._build_search_index(remote_name, packages)
+
+    def _build_search_index(self, remote_name: str, packages: list[AppStreamPackage]):
+        """Build the columnar search index for a remote.
+
+        The searchable fields are stored struct-of-arrays style in parallel
+        lists so the hot search loop reads contiguous columns instead of
+        chasing per-package attributes. Each package also contributes its
+        lowercased name, id and summary to a concatenated corpus, joined by
+        NUL bytes within a package and \\x01 between packages so a keyword can
+        never match across boundaries; `offsets` records where each package's
+        text ends so a hit offset maps back to a package index."""
+        name_l = []
+        id_l = []
+        summary_l = []
+        bundle = []
+        parts = []
+        offsets = []
+        trie_items = []
+        pos = 0
+        for idx, package in enumerate(packages):
+            name_l.append(package._name_l)
+            id_l.append(package._id_l)
+            summary_l.append(package._summary_l)
+            bundle.append(package.flatpak_bundle)
+            text = package._haystack
+            parts.append(text)
+            pos += len(text) + 1
+            offsets.append(pos)
+            trie_items.append((package._name_l, (idx,)))
+            trie_items.append((package._id_l, (idx,)))
+        self._index[remote_name] = {
+            "name_l": name_l,
+            "id_l": id_l,
+            "summary_l": summary_l,
+            "bundle": bundle,
+            "corpus": "\x01".join(parts),
+            "offsets": offsets,
+            "trie": marisa_trie.RecordTrie("<I", trie_items),
+        }
+        if np is not None and packages:
+            # Fixed-width unicode copies of the columns so a query can be
+            # vectorized: np.char.find scans a whole column in C.
+            self._index[remote_name]["name_arr"] = np.array(name_l, dtype=str)
+            self._index[remote_name]["id_arr"] = np.array(id_l, dtype=str)
+            self._index[remote_name]["summary_arr"] = np.array(summary_l, dtype=str)
+        self._generation += 1
+
+    def _materialize(self, repo_name: str, idx: int) -> AppStreamPackage:
+        """Return the full AppStreamPackage behind an index hit"""
+        return self.remotes[repo_name][idx]
 
     def _load_appstream_metadata(
         self, remote: Flatpak.Remote, inst: Flatpak.Installation
     ) -> list[AppStreamPackage]:
         """load AppStrean metadata and create AppStreamPackage objects"""
-        packages = []
-        metadata = AppStream.Metadata.new()
-        metadata.set_format_style(AppStream.FormatStyle.CATALOG)
+        self._refresh_remote_metadata(remote, inst)
+        return self._parse_appstream_metadata(remote)
+
+    def _refresh_remote_metadata(self, remote: Flatpak.Remote, inst: Flatpak.Installation):
+        """Sync a remote's appstream data when refreshing or when missing.
+
+        modify_remote rewrites the shared installation configuration and
+        Flatpak.Installation is not documented as safe for concurrent use,
+        so this phase must not run for several remotes at once."""
         if self.refresh:
             if remote.get_name() == "flathub" or remote.get_name() == "flathub-beta":
                 remote.set_gpg_verify(True)
                 inst.modify_remote(remote, None)
             inst.update_appstream_full_sync(remote.get_name(), None, None, True)
-        appstream_file = Path(remote.get_appstream_dir().get_path() + "/appstream.xml.gz")
+        appstream_dir = remote.get_appstream_dir().get_path()
+        appstream_file = Path(f"{appstream_dir}/appstream.xml.gz")
         if not appstream_file.exists() and check_internet():
             try:
                 if remote.get_name() == "flathub" or remote.get_name() == "flathub-beta":
@@ -434,57 +650,363 @@ class AppstreamSearcher:
                 inst.update_appstream_full_sync(remote.get_name(), None, None, True)
             except GLib.Error as e:
                 logger.error(f"Failed to update AppStream metadata: {str(e)}")
+
+    def _parse_appstream_metadata(self, remote: Flatpak.Remote) -> list[AppStreamPackage]:
+        """Parse a remote's on-disk catalog into AppStreamPackage objects.
+
+        Touches only the remote and the filesystem, so it is safe to run in
+        parallel for several remotes."""
+        packages = []
+        metadata = AppStream.Metadata.new()
+        metadata.set_format_style(AppStream.FormatStyle.CATALOG)
+        appstream_dir = remote.get_appstream_dir().get_path()
+        appstream_file = Path(f"{appstream_dir}/appstream.xml.gz")
         if appstream_file.exists():
+            cached_packages = self._load_snapshot(remote, appstream_file)
+            if cached_packages is not None:
+                return cached_packages
             metadata.parse_file(
                 Gio.File.new_for_path(appstream_file.as_posix()), AppStream.FormatKind.XML
             )
             components: AppStream.ComponentBox = metadata.get_components()
-            i = 0
             for i in range(components.get_size()):
                 component = components.index_safe(i)
-                # if component.get_kind() == AppStream.ComponentKind.DESKTOP_APP:
-                packages.append(AppStreamPackage(component, remote))
+                # Filter before constructing the package: catalog entries
+                # without a flatpak bundle cannot be installed or searched
+                # usefully, so skip them instead of building and discarding.
+                bundle = component.get_bundle(AppStream.BundleKind.FLATPAK)
+                if bundle is None:
+                    continue
+                packages.append(AppStreamPackage(component, remote, bundle, appstream_dir))
+            self._save_snapshot(remote, appstream_file, packages)
             return packages
         else:
             logger.debug(f"AppStream file not found: {appstream_file}")
             return []
 
-    def search_flatpak_repo(self, keyword: str, repo_name: str) -> list[AppStreamPackage]:
-        search_results = []
-        packages = self.remotes[repo_name]
-        found = None
-        for package in packages:
-            # Try matching exact ID first
-            if keyword is package.id:
-                found = package
-                break
-            # Next try matching exact name
-            elif keyword.lower() is package.name.lower():
-                found = package
-                break
-            # Try matching case insensitive ID next
-            elif keyword.lower() is package.id.lower():
-                found = package
-                break
-            # General keyword search
-            elif keyword.lower() in str(package).lower():
-                found = package
+    def _snapshot_path(self, remote: Flatpak.Remote, appstream_file: Path) -> Path:
+        """Snapshot location for a remote, keyed by the catalog's mtime+size
+        so the snapshot is invalidated whenever appstream.xml.gz changes."""
+        stat = os.stat(appstream_file)
+        cache_dir = Path(GLib.get_user_cache_dir()) / "flatshop"
+        return cache_dir / f"{remote.get_name()}-{int(stat.st_mtime)}-{stat.st_size}.pkl"
+
+    def _load_snapshot(self, remote: Flatpak.Remote, appstream_file: Path):
+        """Load packages from the on-disk snapshot, or None if it is missing
+        or stale, in which case the XML catalog has to be parsed again."""
+        try:
+            snapshot_file = self._snapshot_path(remote, appstream_file)
+            if not snapshot_file.exists():
+                return None
+            with open(snapshot_file, "rb") as f:
+                snapshots = pickle.load(f)
+            return [AppStreamPackage._from_snapshot(snapshot, remote) for snapshot in snapshots]
+        except (OSError, pickle.PickleError, KeyError, EOFError) as e:
+            logger.debug(f"Ignoring unreadable catalog snapshot: {str(e)}")
+            return None
+
+    def _save_snapshot(self, remote: Flatpak.Remote, appstream_file: Path, packages: list):
+        """Persist the parsed catalog so later startups can skip the XML"""
+        try:
+            snapshot_file = self._snapshot_path(remote, appstream_file)
+            snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            # Snapshots keyed by older catalog versions of this remote are
+            # dead weight; drop them before writing the current one. The stem
+            # check keeps e.g. 'flathub' from matching 'flathub-beta' files.
+            remote_name = remote.get_name()
+            for stale in snapshot_file.parent.glob(f"{remote_name}-*.pkl"):
+                if stale != snapshot_file and stale.stem.rsplit("-", 2)[0] == remote_name:
+                    stale.unlink(missing_ok=True)
+            snapshots = [package._to_snapshot() for package in packages]
+            # Write-then-rename so a crash mid-dump can never leave a
+            # truncated file under the currently valid snapshot name.
+            tmp_file = snapshot_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(snapshots, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, snapshot_file)
+        except OSError as e:
+            logger.error(f"Error saving catalog snapshot: {str(e)}")
+
+    def _search_repo_indices(
+        self,
+        repo_name: str,
+        keyword_l: str,
+        generation: int,
+        limit: int | None = None,
+        stop_on_name: bool = False,
+    ) -> tuple:
+        """Corpus scan returning (index, match) pairs for a remote.
+
+        Works entirely on the columnar index; no package objects are touched.
+        `limit` stops the scan once enough hits exist (autocomplete-style
+        callers rarely need more than a page) and `stop_on_name` returns as
+        soon as any NAME match is found, for existence-style queries.
+        `generation` is part of the signature only so entries memoized by
+        `_search_cached` fall out whenever the loaded remotes change."""
+        cols = self._index.get(repo_name)
+        if cols is None:
+            return ()
+        corpus = cols["corpus"]
+        offsets = cols["offsets"]
+        name_l = cols["name_l"]
+        id_l = cols["id_l"]
+        hits = []
+        if np is not None and "name_arr" in cols:
+            # Vectorized path: three C-level column scans producing boolean
+            # masks, combined and classified with NAME > ID > SUMMARY priority.
+            mask_name = np.char.find(cols["name_arr"], keyword_l) >= 0
+            mask_id = np.char.find(cols["id_arr"], keyword_l) >= 0
+            mask_summary = np.char.find(cols["summary_arr"], keyword_l) >= 0
+            for idx in np.flatnonzero(mask_name | mask_id | mask_summary):
+                idx = int(idx)
+                if mask_name[idx]:
+                    match = _M_NAME
+                    if stop_on_name:
+                        return ((idx, match),)
+                elif mask_id[idx]:
+                    match = _M_ID
+                else:
+                    match = _M_SUMMARY
+                hits.append((idx, match))
+            hits.sort(key=lambda hit: id_l[hit[0]] != keyword_l)
+            if limit is not None:
+                hits = hits[:limit]
+            return tuple(hits)
+        exact = set()
+        if limit is not None and not stop_on_name:
+            # Seed the exact-ID hits up front so breaking at `limit` cannot
+            # drop them; this keeps the truncated result identical to the
+            # vectorized path, which classifies everything before slicing.
+            for remote_name, idx in self._id_lookup().get(keyword_l, ()):
+                if remote_name != repo_name or id_l[idx] != keyword_l:
+                    continue
+                match = _M_NAME if keyword_l in name_l[idx] else _M_ID
+                hits.append((idx, match))
+                exact.add(idx)
+        # Single pass over the concatenated catalog text; every hit offset is
+        # mapped back to its package, then the scan jumps to the next package.
+        pos = corpus.find(keyword_l)
+        while pos != -1:
+            idx = bisect_right(offsets, pos)
+            if idx in exact:
+                pos = corpus.find(keyword_l, offsets[idx])
+                continue
+            if keyword_l in name_l[idx]:
+                match = _M_NAME
+                if stop_on_name:
+                    return ((idx, match),)
+            elif keyword_l in id_l[idx]:
+                match = _M_ID
+            else:
+                match = _M_SUMMARY
+            hits.append((idx, match))
+            if limit is not None and len(hits) >= limit:
                 break
-        if found:
-            search_results.append(found)
+            pos = corpus.find(keyword_l, offsets[idx])
+        # Exact ID matches first so lookups by application ID stay unambiguous
+        hits.sort(key=lambda hit: id_l[hit[0]] != keyword_l)
+        if limit is not None:
+            hits = hits[:limit]
+        return tuple(hits)
+
+    def search_flatpak_repo(
+        self,
+        keyword: str,
+        repo_name: str,
+        limit: int | None = None,
+        stop_on_name: bool = False,
+    ) -> list[AppStreamPackage]:
+        search_results = []
+        keyword_l = keyword.lower()
+        if not keyword_l:
+            return search_results
+        hits = self._search_cached(repo_name, keyword_l, self._generation, limit, stop_on_name)
+        for idx, match in hits:
+            package = self._materialize(repo_name, idx)
+            package.match = match
+            search_results.append(package)
         return search_results
 
-    def search_flatpak(self, keyword: str, repo_name=None) -> list[AppStreamPackage]:
+    def search_flatpak(
+        self,
+        keyword: str,
+        repo_name=None,
+        limit: int | None = None,
+        stop_on_name: bool = False,
+    ) -> list[AppStreamPackage]:
         """Search packages matching a keyword"""
         search_results = []
-        keyword = keyword
 
         if not repo_name:
-            for remote_name in self.remotes.keys():
-                search_results.extend(self.search_flatpak_repo(keyword, remote_name))
+            remote_names = list(self.remotes.keys())
+            if len(remote_names) > 1:
+                # The corpus scan spends its time in C-level str.find which
+                # releases the GIL, so searching remotes in parallel threads
+                # overlaps the per-remote scans.
+                with ThreadPoolExecutor(max_workers=len(remote_names)) as executor:
+                    futures = [
+                        executor.submit(
+                            self.search_flatpak_repo, keyword, remote_name, limit, stop_on_name
+                        )
+                        for remote_name in remote_names
+                    ]
+                    for future in futures:
+                        search_results.extend(future.result())
+            else:
+                for remote_name in remote_names:
+                    search_results.extend(
+                        self.search_flatpak_repo(keyword, remote_name, limit, stop_on_name)
+                    )
         else:
             if repo_name in self.remotes.keys():
-                search_results.extend(self.search_flatpak_repo(keyword, repo_name))
+                search_results.extend(
+                    self.search_flatpak_repo(keyword, repo_name, limit, stop_on_name)
+                )
+        if limit is not None:
+            search_results = search_results[:limit]
+        return search_results
+
+    def search_flatpak_multi(self, keywords: list[str], repo_name=None) -> list[AppStreamPackage]:
+        """Search packages matching any of several keywords.
+
+        The keywords are compiled into a single regex alternation, so each
+        package costs one pass of CPython's C matcher over its haystack
+        instead of one substring scan per keyword. The match type is
+        classified from the hit position against the field boundaries, the
+        same way AppStreamPackage.search does for a single keyword."""
+        search_results = []
+        keywords_l = [keyword.lower() for keyword in keywords if keyword]
+        if not keywords_l:
+            return search_results
+        pattern = re.compile("|".join(re.escape(keyword_l) for keyword_l in keywords_l))
+
+        if repo_name:
+            remote_names = [repo_name] if repo_name in self.remotes else []
+        else:
+            remote_names = list(self.remotes.keys())
+
+        for remote_name in remote_names:
+            for package in self.remotes[remote_name]:
+                found = pattern.search(package._haystack)
+                if found is None:
+                    continue
+                if found.start() < package._b1:
+                    package.match = _M_NAME
+                elif found.start() < package._b2:
+                    package.match = _M_ID
+                else:
+                    package.match = _M_SUMMARY
+                search_results.append(package)
+        return search_results
+
+    def search_flatpak_prefix(self, keyword: str, repo_name=None) -> list[AppStreamPackage]:
+        """Search packages whose name or ID starts with a keyword"""
+        search_results = []
+        keyword_l = keyword.lower()
+        if not keyword_l:
+            return search_results
+
+        if repo_name:
+            remote_names = [repo_name] if repo_name in self.remotes else []
+        else:
+            remote_names = list(self.remotes.keys())
+
+        for remote_name in remote_names:
+            cols = self._index.get(remote_name)
+            if cols is None:
+                continue
+            seen = set()
+            for _key, (idx,) in cols["trie"].items(keyword_l):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                package = self._materialize(remote_name, idx)
+                package.match = package.search(keyword_l)
+                search_results.append(package)
+        return search_results
+
+    def _bundle_lookup(self) -> dict[str, tuple[str, int]]:
+        """Map flatpak bundle IDs to (remote, index), rebuilt when remotes change"""
+        if self._bundle_map_generation != self._generation:
+            bundle_map = {}
+            for remote_name, cols in self._index.items():
+                for idx, bundle in enumerate(cols["bundle"]):
+                    bundle_map[bundle] = (remote_name, idx)
+            self._bundle_map = bundle_map
+            self._bundle_map_generation = self._generation
+        return self._bundle_map
+
+    def _id_lookup(self) -> dict[str, list[tuple[str, int]]]:
+        """Map lowercased component IDs to (remote, index) hits, rebuilt when
+        remotes change. Legacy catalogs may append ".desktop" to the ID, so
+        the stripped form is indexed as well."""
+        if self._id_map_generation != self._generation:
+            id_map = {}
+            for remote_name, cols in self._index.items():
+                for idx, id_l in enumerate(cols["id_l"]):
+                    id_map.setdefault(id_l, []).append((remote_name, idx))
+                    if id_l.endswith(".desktop"):
+                        stripped = id_l[: -len(".desktop")]
+                        id_map.setdefault(stripped, []).append((remote_name, idx))
+            self._id_map = id_map
+            self._id_map_generation = self._generation
+        return self._id_map
+
+    def search_flatpak_exact(self, app_id: str, repo_name=None) -> list[AppStreamPackage]:
+        """Resolve an exact application ID to its catalog packages.
+
+        Unlike search_flatpak this never matches substrings or summaries,
+        which matters when mapping known IDs (installed refs, Flathub API
+        results) back to catalog entries: a substring search would also
+        return plugins whose ID contains the app's ID and apps that merely
+        mention it in their summary."""
+        search_results = []
+        app_id_l = app_id.lower()
+        if not app_id_l:
+            return search_results
+        for remote_name, idx in self._id_lookup().get(app_id_l, ()):
+            if repo_name and remote_name != repo_name:
+                continue
+            package = self._materialize(remote_name, idx)
+            package.match = _M_ID
+            search_results.append(package)
+        return search_results
+
+    def search_flatpak_pool(self, keyword: str) -> list[AppStreamPackage]:
+        """Search using libappstream's native pool search.
+
+        AppStream.Pool.search tokenizes, matches and ranks entirely in C, so
+        results come back relevance-ordered without any Python-side scanning.
+        Each hit is mapped onto the indexed packages through its flatpak
+        bundle ID; components we have not indexed (e.g. from disabled
+        remotes) are skipped. Falls back to the Python index scan if the
+        pool cannot be loaded."""
+        try:
+            if self._pool is None:
+                pool = AppStream.Pool()
+                pool.set_flags(AppStream.PoolFlags.LOAD_FLATPAK)
+                pool.load()
+                self._pool = pool
+            components = self._pool.search(keyword)
+        except GLib.Error as e:
+            logger.error(f"AppStream pool search failed: {str(e)}")
+            return self.search_flatpak(keyword)
+
+        search_results = []
+        bundle_map = self._bundle_lookup()
+        keyword_l = keyword.lower()
+        for i in range(components.get_size()):
+            component = components.index_safe(i)
+            bundle = component.get_bundle(AppStream.BundleKind.FLATPAK)
+            if bundle is None:
+                continue
+            hit = bundle_map.get(bundle.get_id())
+            if hit is None:
+                continue
+            remote_name, idx = hit
+            package = self._materialize(remote_name, idx)
+            package.match = package.search(keyword_l)
+            search_results.append(package)
         return search_results
 
     def get_all_apps(self, repo_name=None) -> list[AppStreamPackage]:
@@ -541,6 +1063,18 @@ class AppstreamSearcher:
 
         return subcategories
 
+    def get_installed_packages(self) -> list[AppStreamPackage]:
+        """Resolve the installed refs recorded by add_installation to their
+        catalog packages through the bundle lookup — an exact O(1) match per
+        ref, with refs from unloaded remotes skipped."""
+        packages = []
+        bundle_map = self._bundle_lookup()
+        for ref in sorted(self.installed):
+            hit = bundle_map.get(ref)
+            if hit is not None:
+                packages.append(self._materialize(*hit))
+        return packages
+
     def get_installed_apps(self, system=False) -> list[tuple[str, str, str]]:
         """Get a list of all installed Flatpak applications with their repository source"""
         installed_refs = []
@@ -722,16 +1256,12 @@ class AppstreamSearcher:
             # Process categories one at a time to keep GUI responsive
             for category, title in categories.items():
                 if "installed" in category:
-                    installed_apps = searcher.get_installed_apps(system)
-                    for app_id, repo_name, repo_type in installed_apps:
-                        if repo_name:
-                            search_result = searcher.search_flatpak(app_id, repo_name)
-                            self.installed_results.extend(search_result)
+                    self.installed_results.extend(searcher.get_installed_packages())
                 elif "updates" in category:
                     updates = searcher.check_updates(system)
                     for repo_name, app_id, repo_type in updates:
                         if repo_name:
-                            search_result = searcher.search_flatpak(app_id, repo_name)
+                            search_result = searcher.search_flatpak_exact(app_id, repo_name)
                             self.updates_results.extend(search_result)
                 # Update progress bar
                 self.refresh_progress = (current_category / total_categories) * 100
@@ -787,7 +1317,7 @@ class AppstreamSearcher:
             if category in self.category_groups["collections"]:
                 apps = [app["app_id"] for app in collection["data"].get("hits", [])]
                 for app_id in apps:
-                    search_result = self.search_flatpak(app_id, "flathub")
+                    search_result = self.search_flatpak_exact(app_id, "flathub")
                     self.collection_results.extend(search_result)
         return self._get_current_results()
 
@@ -829,7 +1359,7 @@ class AppstreamSearcher:
             if collection["category"] == category:
                 apps = [app["app_id"] for app in collection["data"].get("hits", [])]
                 for app_id in apps:
-                    search_result = self.search_flatpak(app_id, "flathub")
+                    search_result = self.search_flatpak_exact(app_id, "flathub")
                     self.collection_results.extend(search_result)
 
     def _should_refresh(self):
@@ -849,7 +1379,7 @@ class AppstreamSearcher:
                 apps = api_data["hits"]
                 for app in apps:
                     app_id = app["app_id"]
-                    search_result = searcher.search_flatpak(app_id, "flathub")
+                    search_result = searcher.search_flatpak_exact(app_id, "flathub")
                     if category in self.category_groups["collections"]:
                         self.update_collection_results(search_result)
                     else:
@@ -860,16 +1390,12 @@ class AppstreamSearcher:
     def _process_system_category(self, searcher, category, system=False):
         """Process system-related categories."""
         if "installed" in category:
-            installed_apps = searcher.get_installed_apps(system)
-            for app_id, repo_name, repo_type in installed_apps:
-                if repo_name:
-                    search_result = searcher.search_flatpak(app_id, repo_name)
-                    self.installed_results.extend(search_result)
+            self.installed_results.extend(searcher.get_installed_packages())
         elif "updates" in category:
             updates = searcher.check_updates(system)
             for app_id, repo_name, repo_type in updates:
                 if repo_name:
-                    search_result = searcher.search_flatpak(app_id, repo_name)
+                    search_result = searcher.search_flatpak_exact(app_id, repo_name)
                     self.updates_results.extend(search_result)
 
     def _get_current_results(self):